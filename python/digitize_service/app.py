@@ -10,14 +10,128 @@ from flask_cors import CORS
 import numpy as np
 from PIL import Image
 import io
+import os
 import time
 import traceback
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from streaming_form_data import StreamingFormDataParser, ParseFailedException
+    from streaming_form_data.targets import ValueTarget
+    HAS_STREAMING_FORM_DATA = True
+except ImportError:
+    HAS_STREAMING_FORM_DATA = False
+
+    class ParseFailedException(Exception):
+        """Placeholder - only raised by streaming-form-data."""
 
 from .viterbi import extract_signal, extract_multi_lead, ExtractionResult
 
 app = Flask(__name__)
 CORS(app)  # Allow requests from browser (localhost)
 
+# Multipart fields understood by the endpoints (besides the image itself)
+FORM_FIELDS = ('paper_speed', 'voltage_scale', 'lead_hint', 'crop')
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+# Extraction is CPU-bound and holds the GIL for most of its runtime, so it runs
+# in a process pool. EKGQ_EXTRACT_WORKERS=0 runs it inline on the request thread.
+EXTRACT_WORKERS = int(os.environ.get('EKGQ_EXTRACT_WORKERS', os.cpu_count() or 1))
+_executor = None
+
+
+def _get_executor():
+    """Create the extraction pool on first use (after any server fork)."""
+    global _executor
+    if _executor is None:
+        _executor = ProcessPoolExecutor(max_workers=EXTRACT_WORKERS)
+    return _executor
+
+
+def _run_extract(image_bytes, crop, paper_speed, voltage_scale, lead_hint):
+    """
+    Decode an uploaded image and run extract_signal on it.
+
+    Runs inside a pool worker: only the raw upload is pickled across, and the
+    decoded array never leaves the worker.
+
+    Returns:
+        (ExtractionResult, (width, height) of the image that was extracted)
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+
+    # Convert to RGB if necessary (handles PNG with alpha, etc.)
+    if image.mode == 'RGBA':
+        # Create white background
+        background = Image.new('RGB', image.size, (255, 255, 255))
+        background.paste(image, mask=image.split()[3])
+        image = background
+    elif image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    image_array = np.array(image)
+
+    # Handle crop if provided
+    if crop:
+        import json
+        try:
+            crop = json.loads(crop)
+            x1, y1 = int(crop.get('x1', 0)), int(crop.get('y1', 0))
+            x2, y2 = int(crop.get('x2', image_array.shape[1])), int(crop.get('y2', image_array.shape[0]))
+            image_array = image_array[y1:y2, x1:x2]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            pass  # Ignore invalid crop, use full image
+
+    # Raw bytes are passed along for potential Claude vision fallback
+    result = extract_signal(
+        image_array,
+        paper_speed_mm_s=paper_speed,
+        voltage_scale_mm_mV=voltage_scale,
+        target_fs=500,
+        lead_hint=lead_hint,
+        image_bytes=image_bytes
+    )
+    return result, (image_array.shape[1], image_array.shape[0])
+
+
+def _parse_upload():
+    """
+    Parse the multipart request body.
+
+    With streaming-form-data installed the body is fed to its parser in
+    64 KiB blocks straight into memory, bypassing Werkzeug's multipart
+    parser (and its spooled temp file) entirely. Otherwise falls back to
+    request.files / request.form.
+
+    Returns:
+        (form, image_bytes) - form fields as a dict of strings and the raw
+        image bytes, or None if no image was uploaded
+    """
+    if not HAS_STREAMING_FORM_DATA or request.mimetype != 'multipart/form-data':
+        image_file = request.files.get('image')
+        image_bytes = image_file.read() if image_file is not None else None
+        return request.form.to_dict(), image_bytes
+
+    parser = StreamingFormDataParser(headers=request.headers)
+    image_target = ValueTarget()
+    parser.register('image', image_target)
+    field_targets = {name: ValueTarget() for name in FORM_FIELDS}
+    for name, target in field_targets.items():
+        parser.register(name, target)
+
+    stream = request.stream
+    while True:
+        chunk = stream.read(UPLOAD_CHUNK_SIZE)
+        if not chunk:
+            break
+        parser.data_received(chunk)
+
+    form = {name: target.value.decode('utf-8')
+            for name, target in field_targets.items() if target.value}
+    # Like request.files, only a part sent with a filename counts as the upload
+    image_bytes = image_target.value if image_target.multipart_filename is not None else None
+    return form, image_bytes
+
 
 @app.route('/api/health', methods=['GET'])
 def health():
@@ -70,8 +184,17 @@ def digitize():
     """
     start_time = time.time()
 
+    try:
+        form, image_bytes = _parse_upload()
+    except ParseFailedException as e:
+        return jsonify({
+            "success": False,
+            "error": f"Malformed upload: {str(e)}",
+            "suggestion": "Include image file in multipart/form-data request"
+        }), 400
+
     # Validate request
-    if 'image' not in request.files:
+    if image_bytes is None:
         return jsonify({
             "success": False,
             "error": "No image provided",
@@ -80,9 +203,9 @@ def digitize():
 
     # Parse parameters
     try:
-        paper_speed = float(request.form.get('paper_speed', 25))
-        voltage_scale = float(request.form.get('voltage_scale', 10))
-        lead_hint = request.form.get('lead_hint', 'II')
+        paper_speed = float(form.get('paper_speed', 25))
+        voltage_scale = float(form.get('voltage_scale', 10))
+        lead_hint = form.get('lead_hint', 'II')
     except ValueError as e:
         return jsonify({
             "success": False,
@@ -91,47 +214,12 @@ def digitize():
         }), 400
 
     try:
-        # Load image
-        image_file = request.files['image']
-
-        # Read raw bytes for potential Claude vision fallback
-        image_bytes = image_file.read()
-        image_file.seek(0)  # Reset for PIL
-
-        image = Image.open(image_file)
-
-        # Convert to RGB if necessary (handles PNG with alpha, etc.)
-        if image.mode == 'RGBA':
-            # Create white background
-            background = Image.new('RGB', image.size, (255, 255, 255))
-            background.paste(image, mask=image.split()[3])
-            image = background
-        elif image.mode != 'RGB':
-            image = image.convert('RGB')
-
-        image_array = np.array(image)
-
-        # Handle crop if provided
-        crop = request.form.get('crop')
-        if crop:
-            import json
-            try:
-                crop = json.loads(crop)
-                x1, y1 = int(crop.get('x1', 0)), int(crop.get('y1', 0))
-                x2, y2 = int(crop.get('x2', image_array.shape[1])), int(crop.get('y2', image_array.shape[0]))
-                image_array = image_array[y1:y2, x1:x2]
-            except (json.JSONDecodeError, KeyError, TypeError):
-                pass  # Ignore invalid crop, use full image
-
-        # Extract signal
-        result = extract_signal(
-            image_array,
-            paper_speed_mm_s=paper_speed,
-            voltage_scale_mm_mV=voltage_scale,
-            target_fs=500,
-            lead_hint=lead_hint,
-            image_bytes=image_bytes
-        )
+        # Decode + extract signal (in a worker process unless disabled)
+        task = (image_bytes, form.get('crop'), paper_speed, voltage_scale, lead_hint)
+        if EXTRACT_WORKERS > 0:
+            result, image_size = _get_executor().submit(_run_extract, *task).result()
+        else:
+            result, image_size = _run_extract(*task)
 
         processing_time = (time.time() - start_time) * 1000
 
@@ -179,7 +267,7 @@ def digitize():
             "metadata": {
                 "algorithm": result.method,
                 "processing_time_ms": round(processing_time, 1),
-                "image_size": [image_array.shape[1], image_array.shape[0]]
+                "image_size": list(image_size)
             }
         })
 
@@ -220,7 +308,15 @@ def calibrate():
             }
         }
     """
-    if 'image' not in request.files:
+    try:
+        _, image_bytes = _parse_upload()
+    except ParseFailedException as e:
+        return jsonify({
+            "success": False,
+            "error": f"Malformed upload: {str(e)}"
+        }), 400
+
+    if image_bytes is None:
         return jsonify({
             "success": False,
             "error": "No image provided"
@@ -229,8 +325,7 @@ def calibrate():
     try:
         from .viterbi import detect_grid_spacing
 
-        image_file = request.files['image']
-        image = Image.open(image_file)
+        image = Image.open(io.BytesIO(image_bytes))
 
         if image.mode == 'RGBA':
             background = Image.new('RGB', image.size, (255, 255, 255))
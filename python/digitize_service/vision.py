@@ -10,6 +10,14 @@ import os
 from typing import List, Tuple, Optional
 from dataclasses import dataclass
 
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
 
 @dataclass
 class TraceColorInfo:
@@ -128,10 +136,10 @@ Rules:
 
 
 def create_color_mask(
-    image: "np.ndarray",
+    image: np.ndarray,
     target_colors: List[Tuple[int, int, int]],
     tolerance: int = 50
-) -> "np.ndarray":
+) -> np.ndarray:
     """
     Create a binary mask for pixels matching target colors.
 
@@ -143,26 +151,61 @@ def create_color_mask(
     Returns:
         Binary mask where True = pixel matches a target color
     """
-    import numpy as np
+    if HAS_NUMBA and len(target_colors) > 0:
+        targets = np.asarray(target_colors, dtype=np.int32).reshape(-1, 3)
+        rgb = np.ascontiguousarray(image[:, :, :3])
+        mask = _color_mask_kernel(rgb, targets, float(tolerance * tolerance))
+        return mask.view(np.bool_)
+
+    return _color_mask_numpy(image, target_colors, tolerance)
 
+
+def _color_mask_numpy(
+    image: np.ndarray,
+    target_colors: List[Tuple[int, int, int]],
+    tolerance: int
+) -> np.ndarray:
+    """NumPy implementation of create_color_mask (one pass per color)."""
     H, W = image.shape[:2]
     mask = np.zeros((H, W), dtype=bool)
 
-    for target_rgb in target_colors:
-        tr, tg, tb = target_rgb
+    # Cast once outside the loop; int16 holds any channel difference and the
+    # squared sum is accumulated in int32 (max 3 * 255**2 overflows int16)
+    pixels = image[:, :, :3].astype(np.int16)
+    diff = np.empty_like(pixels)
+    tol_sq = tolerance * tolerance
 
-        # Calculate color distance
-        R = image[:, :, 0].astype(np.float32)
-        G = image[:, :, 1].astype(np.float32)
-        B = image[:, :, 2].astype(np.float32)
+    for target_rgb in target_colors:
+        np.subtract(pixels, np.asarray(target_rgb, dtype=np.int16), out=diff)
 
-        distance = np.sqrt(
-            (R - tr) ** 2 +
-            (G - tg) ** 2 +
-            (B - tb) ** 2
-        )
+        # Squared color distance - compare against tolerance**2, no sqrt
+        dist_sq = np.einsum('hwc,hwc->hw', diff, diff, dtype=np.int32)
 
         # Pixels within tolerance
-        mask = mask | (distance < tolerance)
+        np.logical_or(mask, dist_sq < tol_sq, out=mask)
 
     return mask
+
+
+if HAS_NUMBA:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _color_mask_kernel(image, targets, tol_sq):
+        """Single pass over the image testing every target color per pixel."""
+        H, W = image.shape[0], image.shape[1]
+        K = targets.shape[0]
+        mask = np.zeros((H, W), dtype=np.uint8)
+
+        for y in prange(H):
+            for x in range(W):
+                r = np.int32(image[y, x, 0])
+                g = np.int32(image[y, x, 1])
+                b = np.int32(image[y, x, 2])
+                for k in range(K):
+                    dr = r - targets[k, 0]
+                    dg = g - targets[k, 1]
+                    db = b - targets[k, 2]
+                    if dr * dr + dg * dg + db * db < tol_sq:
+                        mask[y, x] = 1
+                        break
+
+        return mask
@@ -0,0 +1,135 @@
+"""
+Tests for digitize_service module.
+
+Run with: pytest python/tests/
+"""
+
+import pytest
+import io
+import numpy as np
+from pathlib import Path
+import sys
+
+# Add parent to path for imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from digitize_service.vision import create_color_mask, _color_mask_numpy, HAS_NUMBA
+
+flask = pytest.importorskip("flask")
+from PIL import Image
+from digitize_service import app as app_module
+
+
+# =============================================================================
+# FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def random_rgb():
+    """Random RGB image covering the full 0-255 range."""
+    rng = np.random.default_rng(42)
+    return rng.integers(0, 256, size=(64, 80, 3), dtype=np.uint8)
+
+
+@pytest.fixture
+def synthetic_ecg_image():
+    """Black sinusoidal trace on a pink 10 px/mm grid."""
+    H, W, spacing = 300, 1000, 10
+    img = np.full((H, W, 3), 255, dtype=np.uint8)
+    img[:, ::spacing] = (250, 200, 200)
+    img[::spacing, :] = (250, 200, 200)
+
+    x = np.arange(W)
+    y = (H * 0.7 + 25 * np.sin(2 * np.pi * x / 150)).astype(int)
+    for dy in (-1, 0, 1):
+        img[y + dy, x] = 0
+    return img
+
+
+@pytest.fixture
+def png_bytes(synthetic_ecg_image):
+    """Synthetic ECG encoded as PNG."""
+    buf = io.BytesIO()
+    Image.fromarray(synthetic_ecg_image).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def client():
+    """Flask test client for the digitization service."""
+    return app_module.app.test_client()
+
+
+# =============================================================================
+# VISION TESTS
+# =============================================================================
+
+class TestColorMask:
+    """Tests for create_color_mask."""
+
+    def test_matches_euclidean_distance(self, random_rgb):
+        """Mask equals a plain Euclidean-distance threshold."""
+        targets = [(0, 0, 255), (0, 0, 0), (255, 255, 255)]
+        img = random_rgb.astype(np.float64)
+        expected = np.zeros(random_rgb.shape[:2], dtype=bool)
+        for t in targets:
+            expected |= np.sqrt(((img - np.array(t)) ** 2).sum(axis=2)) < 60
+
+        mask = create_color_mask(random_rgb, targets, tolerance=60)
+
+        assert mask.dtype == bool
+        assert np.array_equal(mask, expected)
+
+    def test_no_overflow_at_max_distance(self):
+        """Opposite corners of the RGB cube must not wrap around."""
+        img = np.full((4, 4, 3), 255, dtype=np.uint8)
+        mask = create_color_mask(img, [(0, 0, 0)], tolerance=50)
+        assert not mask.any()
+
+    @pytest.mark.skipif(not HAS_NUMBA, reason="numba not installed")
+    def test_numba_kernel_matches_numpy(self, random_rgb):
+        """JIT kernel and NumPy fallback agree."""
+        targets = [(0, 0, 255), (30, 30, 30)]
+        expected = _color_mask_numpy(random_rgb, targets, 80)
+        assert np.array_equal(create_color_mask(random_rgb, targets, 80), expected)
+
+
+# =============================================================================
+# API TESTS
+# =============================================================================
+
+class TestDigitizeAPI:
+    """Tests for the Flask endpoints."""
+
+    def _post(self, client, png_bytes, **fields):
+        data = {"image": (io.BytesIO(png_bytes), "ecg.png"), **fields}
+        return client.post("/api/digitize", data=data, content_type="multipart/form-data")
+
+    def test_digitize_success(self, client, png_bytes):
+        """Synthetic ECG digitizes to a 500 Hz lead II."""
+        response = self._post(client, png_bytes, paper_speed="25", lead_hint="II")
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data["success"]
+        lead = data["leads"]["II"]
+        assert lead["fs"] == 500
+        assert len(lead["samples_uV"]) == int(lead["duration_s"] * 500)
+        assert data["calibration"]["px_per_mm"] == pytest.approx(10.0, abs=0.1)
+
+    def test_missing_image(self, client):
+        """Request without an image is rejected."""
+        response = client.post("/api/digitize", data={"paper_speed": "25"},
+                               content_type="multipart/form-data")
+        assert response.status_code == 400
+        assert response.get_json()["error"] == "No image provided"
+
+    @pytest.mark.skipif(not app_module.HAS_STREAMING_FORM_DATA,
+                        reason="streaming-form-data not installed")
+    def test_streaming_parser_matches_werkzeug(self, client, png_bytes, monkeypatch):
+        """Streaming multipart parser and Werkzeug fallback agree."""
+        streamed = self._post(client, png_bytes, voltage_scale="20").get_json()
+        monkeypatch.setattr(app_module, "HAS_STREAMING_FORM_DATA", False)
+        fallback = self._post(client, png_bytes, voltage_scale="20").get_json()
+
+        assert streamed["leads"] == fallback["leads"]